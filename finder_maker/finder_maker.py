@@ -45,7 +45,7 @@ def get_coords(ra_in, dec_in):
 
     return ra, dec
 
-def create_finder(aperture_size_pix, image_radius_pix, arrow_size_wcs, image_upper_std, image_lower_std, ra_in, dec_in, target_name, instructions, target_color = '', interactive = True, wcs_data = '', image_data = '', offset_coords = ''):
+def create_finder(aperture_size_pix, image_radius_pix, arrow_size_wcs, image_upper_std, image_lower_std, ra_in, dec_in, target_name, instructions, target_color = '', interactive = True, wcs_data = '', image_data = '', offset_coords = '', output_format = 'jpg', dpi = 200, quality = None):
     '''
     Create a finder chart from an image at the specified coordinates
 
@@ -61,7 +61,10 @@ def create_finder(aperture_size_pix, image_radius_pix, arrow_size_wcs, image_upp
     target_color      : Filter color: 'g', 'r', 'i', 'z', or 'y'
     instructions      : Is the transient nuclear or there?
     wcs_data          : wcs variable with coordinate info
-    image_data        : CCDData object with data
+    image_data        : CCDData object or array with data (can be a memmap)
+    output_format     : Format of the output image: 'jpg', 'png', 'pdf', etc.
+    dpi               : Resolution of the output image
+    quality           : JPEG quality from 1 to 95, None for the default
 
     Output
     ---------------
@@ -83,6 +86,11 @@ def create_finder(aperture_size_pix, image_radius_pix, arrow_size_wcs, image_upp
     ymax = int(coord_pix[1] + image_radius_pix)
     cropped_data = image_data[ymin:ymax,xmin:xmax]
 
+    # Region to display, including pixels xmax and ymax so the image fills the axes
+    ymax_plot    = min(ymax + 1, image_data.shape[0])
+    xmax_plot    = min(xmax + 1, image_data.shape[1])
+    display_data = image_data[ymin:ymax_plot,xmin:xmax_plot]
+
     python_version = sys.version_info[0]
     if python_version == 3:
         average_background, _, std_background = sigma_clipped_stats(cropped_data, sigma_lower=2.0, sigma_upper=1.0, maxiters=5)
@@ -128,7 +136,8 @@ def create_finder(aperture_size_pix, image_radius_pix, arrow_size_wcs, image_upp
     # Plot
     plt.xlim(xmin, xmax)
     plt.ylim(ymin, ymax)
-    plt.imshow(image_data, vmin = average_background-image_upper_std*std_background, vmax = average_background+image_lower_std*std_background, cmap='Greys', origin='lower',interpolation='none')
+    # Only plot the displayed region, so memmapped templates are not read in full
+    plt.imshow(display_data, extent = (xmin - 0.5, xmax_plot - 0.5, ymin - 0.5, ymax_plot - 0.5), vmin = average_background-image_upper_std*std_background, vmax = average_background+image_lower_std*std_background, cmap='Greys', origin='lower',interpolation='none')
     plt.tick_params(axis='both', left=False, top=False, right=False, bottom=False, labelleft=False, labeltop=False, labelright=False, labelbottom=False)
 
     # Target
@@ -156,7 +165,11 @@ def create_finder(aperture_size_pix, image_radius_pix, arrow_size_wcs, image_upp
 
     # Instructions
     plt.xlabel(instructions, fontproperties = 'serif')
-    plt.savefig(target_name + '_finder.jpg', dpi = 200, bbox_inches = 'tight')
+    output_format = output_format.lstrip('.').lower()
+    save_kwargs   = {}
+    if quality is not None and output_format in ['jpg', 'jpeg']:
+        save_kwargs['pil_kwargs'] = {'quality': int(quality)}
+    plt.savefig(target_name + '_finder.' + output_format, format = output_format, dpi = dpi, bbox_inches = 'tight', **save_kwargs)
     plt.clf()
 
 def download_ps1_image(ra, dec, filt, save_template = False, plot_name = '', workdir = '.'):
@@ -331,11 +344,93 @@ def query_TNS(object_name):
 
     return ra, dec, object_type
 
-def generate_template(ra, dec, color, object_name, out_size = 1500, image_radius = 250):
+def write_template(refdata, template_name, header_keys = None, template_dtype = 'float64', compress = False, quantize_level = 16):
+    '''
+    Write a template CCDData object to a FITS file, optionally
+    as float32 and/or as a RICE tile-compressed image.
+
+    Parameters
+    ---------------
+    refdata        : CCDData object with data and WCS
+    template_name  : Name of the output .fits file
+    header_keys    : Dictionary of extra header keywords to add
+    template_dtype : Data type to store the image as, 'float64' or 'float32'
+    compress       : Save as a RICE tile-compressed FITS file?
+    quantize_level : RICE quantization level, the quantization step is the
+                     background noise divided by this value, so a higher value
+                     keeps more precision. The default of 16 (step = sigma/16)
+                     is lossy but well below the noise, fine for display.
+    '''
+
+    if np.dtype(template_dtype) not in [np.float32, np.float64]:
+        raise ValueError("template_dtype must be 'float32' or 'float64', not %s"%template_dtype)
+
+    # Convert to the requested data type
+    hdulist = refdata.to_hdu()
+    header  = hdulist[0].header
+    data    = np.asarray(hdulist[0].data, dtype = template_dtype)
+    if header_keys is None:
+        header_keys = {}
+    for key, value in header_keys.items():
+        header[key] = value
+
+    if compress:
+        # Compressed images live in the first extension
+        image_hdu = fits.CompImageHDU(data, header, compression_type = 'RICE_1', quantize_level = quantize_level)
+        output    = fits.HDUList([fits.PrimaryHDU(), image_hdu])
+    else:
+        output    = fits.HDUList([fits.PrimaryHDU(data, header)])
+
+    output.writeto(template_name, overwrite=True)
+
+def load_template(template_name, memmap = True):
+    '''
+    Load an image or a template written by generate_template, either
+    plain or tile-compressed. Uncompressed images are memory mapped so only
+    the region that gets plotted is read from disk.
+
+    Parameters
+    ---------------
+    template_name : Name of the .fits file
+    memmap        : Memory map the data instead of reading it in?
+
+    Output
+    ---------------
+    wcs_data   : wcs variable with coordinate info
+    image_data : Image data array
+    image_head : Header of the image
+    '''
+
+    hdulist = fits.open(template_name, memmap = memmap)
+
+    # Use the first extension that has image data
+    image_hdus = [hdu for hdu in hdulist if hdu.is_image and hdu.data is not None]
+    if len(image_hdus) == 0:
+        hdulist.close()
+        raise ValueError('No image data found in %s'%template_name)
+
+    image_head = image_hdus[0].header
+    image_data = image_hdus[0].data
+
+    # The data is already in memory, so the file can be closed
+    if not memmap:
+        hdulist.close()
+
+    # FLWO needs to overwrite EPOCH label for WCS data
+    if 'EQUINOX' in image_head:
+        image_head.set('EPOCH', image_head['EQUINOX'])
+    wcs_data   = wcs.WCS(image_head)
+
+    return wcs_data, image_data, image_head
+
+def generate_template(ra, dec, color, object_name, out_size = 1500, image_radius = 250, template_dtype = 'float64', compress = False, quantize_level = 16):
     '''
     Download the template from PS1, but check the corners to make sure it's
     not close to the edge. If it is close to the edge, then download more 
     templates to combine.
+
+    The template can be saved as float32 and/or RICE tile-compressed to
+    save disk space, see write_template.
     '''
 
     # Create Empty WCS object to project the images onto
@@ -390,11 +485,8 @@ def generate_template(ra, dec, color, object_name, out_size = 1500, image_radius
     refdata_output = np.nanmean((refdata0_reprojected, refdata1_reprojected, refdata2_reprojected, refdata3_reprojected, refdata4_reprojected), axis = 0)
     template_name = object_name.replace(' ', '') + '_template.fits'
     refdata = CCDData(refdata_output, wcs=wcs_object, unit='adu')
-    refdata.write(template_name, overwrite=True)
 
-    fits.setval(template_name, 'RA'    , value = ra)
-    fits.setval(template_name, 'DEC'   , value = dec)
-    fits.setval(template_name, 'FILTER', value = color)
-    fits.setval(template_name, 'OBJECT', value = object_name)
+    header_keys = OrderedDict([('RA', ra), ('DEC', dec), ('FILTER', color), ('OBJECT', object_name)])
+    write_template(refdata, template_name, header_keys, template_dtype, compress, quantize_level)
 
     return wcs_object, refdata
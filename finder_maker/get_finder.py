@@ -88,9 +88,34 @@ if do_offset != 'n':
 else:
     offset_coords = ''
 
+# Store the template as compact float32?
+do_float32 = input("\n> Save the template as float32? y/[n] ")
+if not do_float32: do_float32='n'
+template_dtype = 'float32' if do_float32 == 'y' else 'float64'
+
+# Store the template as a compressed file?
+do_compress = input("\n> Save the template RICE compressed? y/[n] ")
+if not do_compress: do_compress='n'
+compress = do_compress == 'y'
+
+# Set the output format, dpi, and quality
+output_format = 'jpg'
+dpi           = 200
+quality       = None
+
+do_output = input("\n> Save finder as %s at %s dpi? [y]/n "%(output_format, dpi))
+if not do_output: do_output='y'
+
+if do_output != 'y':
+    output_format = input('\n> Specify output format (jpg, png, pdf): ')
+    dpi           = int(input('\n> Specify dpi: '))
+    if output_format in ['jpg', 'jpeg']:
+        quality = input('\n> Specify JPEG quality (1-95, blank for default): ')
+        quality = int(quality) if quality else None
+
 # Generate the Template
 try:
-    wcs_object, refdata = generate_template(ra, dec, color, object_name, int(out_size) * 3, image_radius = 250)
+    wcs_object, refdata = generate_template(ra, dec, color, object_name, int(out_size) * 3, image_radius = 250, template_dtype = template_dtype, compress = compress)
     continue_run = True
 except:
     print('Object Probably not in 3PI')
@@ -104,4 +129,4 @@ image_lower_std   = 10.0 # Image lower std for plotting
 print(out_size)
 
 if continue_run:
-    create_finder(aperture_size_pix, int(out_size), arrow_size_wcs, image_upper_std, image_lower_std, ra, dec, object_name, instructions, color, wcs_data = wcs_object, image_data = refdata, offset_coords = offset_coords)
+    create_finder(aperture_size_pix, int(out_size), arrow_size_wcs, image_upper_std, image_lower_std, ra, dec, object_name, instructions, color, wcs_data = wcs_object, image_data = refdata, offset_coords = offset_coords, output_format = output_format, dpi = dpi, quality = quality)
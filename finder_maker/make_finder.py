@@ -5,7 +5,7 @@ import matplotlib.pyplot as plt
 from astropy.io import fits
 from astropy import wcs
 import requests
-from finder_maker import create_finder
+from finder_maker import create_finder, load_template
 import sys
 
 script = np.where(['_finder.py' in i for i in sys.argv])[0][0]
@@ -14,19 +14,8 @@ if len(sys.argv) > script + 1:
 else:
     image_name = input('\n> File name: ')
 
-# Import Image Data
-file       = fits.open(image_name)
-image_data = file[0].data
-image_head = file[0].header
-
-# FLWO needs to overwrite EPOCH label for WCS data
-try:
-    # Set the value of EPOCH to the value of EQUINOX
-     image_head.set('EPOCH', image_head['EQUINOX'])
-except:
-    pass
-# Read in WCS data
-wcs_data = wcs.WCS(image_head)
+# Import Image Data, memory mapped if it is not compressed
+wcs_data, image_data, image_head = load_template(image_name)
 
 # Try to read in target name information
 try: